@@ -9,16 +9,39 @@ An AI-powered research assistant that can:
 """
 
 import os
+import re
+import time
 import asyncio
+import hashlib
+import logging
+import uuid
 import aiohttp
-import json
+import orjson
+from collections import OrderedDict, deque
+from itertools import islice
+from difflib import SequenceMatcher
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify
+from quart import Quart, Response, render_template, request, jsonify
+from quart.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = Flask(__name__)
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for faster request/response encoding."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app = Quart(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.getenv('SECRET_KEY', 'research-agent-dev-key')
 
 # Configuration
@@ -26,6 +49,144 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 SERPER_API_KEY = os.getenv('SERPER_API_KEY')  # For Google search
 DEMO_MODE = not OPENAI_API_KEY
 
+# Shared HTTP connection pool settings
+HTTP_CONNECTION_LIMIT = 32
+HTTP_TIMEOUT_SECONDS = 30
+
+# Streamed OpenAI completions have no total HTTP timeout (the per-stage
+# caps below bound them); only connecting and stalls between chunks do
+OPENAI_STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
+
+# Per-provider concurrency limits and retry policy for rate-limited calls
+OPENAI_CONCURRENCY = 5
+SERPER_CONCURRENCY = 10
+RETRY_ATTEMPTS = 4
+SERPER_RETRY_ATTEMPTS = 3  # 1s + 2s of backoff fits inside SEARCH_TIMEOUT_SECONDS
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_BACKOFF_SECONDS = 1
+RETRY_BACKOFF_MAX_SECONDS = 8
+
+# Also merge near-duplicate search queries, not just exact repeats; with it
+# on, queries more similar than the threshold (SequenceMatcher ratio) are
+# searched once
+FUZZY_QUERY_DEDUP = False
+QUERY_SIMILARITY_THRESHOLD = 0.9
+
+# Prompt budget for search sources sent to the analysis step
+MAX_SOURCES_PER_QUERY = 5
+SNIPPET_MAX_CHARS = 280
+
+# Number of completed researches kept in memory, and how many /api/history returns
+HISTORY_LIMIT = 100
+HISTORY_PAGE_SIZE = 10
+
+# Number of background research jobs tracked for polling
+JOB_LIMIT = 100
+
+# Model and output-token budget per pipeline step; extraction runs on the
+# smaller, cheaper model
+PLAN_MODEL = 'gpt-3.5-turbo'
+ANALYSIS_MODEL = 'gpt-4o-mini'
+SYNTHESIS_MODEL = 'gpt-3.5-turbo'
+PLAN_MAX_TOKENS = 600
+ANALYSIS_MAX_TOKENS = 256  # per query in a batch
+SYNTHESIS_MAX_TOKENS = 1200
+SINGLE_SHOT_MAX_TOKENS = 1600
+
+# Search results analyzed per OpenAI call, capped by prompt size (~6k tokens)
+ANALYSIS_BATCH_SIZE = 4
+ANALYSIS_BATCH_MAX_CHARS = 24_000
+
+# Timeouts (seconds) so one slow call can't stall a pipeline stage
+SEARCH_TIMEOUT_SECONDS = 8
+SEARCH_STAGE_TIMEOUT_SECONDS = 15
+PLAN_TIMEOUT_SECONDS = 30
+ANALYSIS_CALL_TIMEOUT_SECONDS = 20
+SYNTHESIS_TIMEOUT_SECONDS = 45
+
+# Upper bound (seconds) on the parallel analysis stage, per research depth
+ANALYSIS_TIMEOUTS = {'quick': 20, 'standard': 30, 'deep': 45}
+
+# Prompts are split into a static head and a small dynamic tail: only the
+# tail is formatted per call, and the shared head is a stable prefix for
+# provider-side prompt caching.
+PLAN_PROMPT_HEAD = """You are a research planning agent. Given a research question, create a comprehensive research plan.
+
+Return a JSON object with:
+1. "main_objective": Clear statement of what we're trying to learn
+2. "sub_questions": List of specific questions to answer
+3. "search_queries": List of optimized search queries to find answers
+4. "expected_sources": Types of sources we should look for
+
+"""
+PLAN_PROMPT_TAIL = """Research Question: {query}
+Depth: {depth} (quick=3 searches, standard=5 searches, deep=8 searches)
+
+Return ONLY valid JSON, no markdown."""
+
+ANALYSIS_PROMPT_HEAD = """You are a research analyst extracting key findings from web search results.
+
+For each numbered search query below, extract 2-3 key findings. Return a JSON object with a "results" key holding an array with one entry per query: an object with "query" and "findings" keys, where "findings" is an array of objects with "finding" and "confidence" (high/medium/low) keys.
+
+"""
+ANALYSIS_PROMPT_TAIL = """Researching: "{original_query}"
+
+{queries}"""
+ANALYSIS_QUERY_BLOCK = """{index}. Search query: "{query}"
+Sources:
+{sources}"""
+
+SYNTHESIS_PROMPT_HEAD = """You are a research analyst synthesizing findings into a comprehensive report.
+
+Create a research report with:
+1. "executive_summary": 2-3 sentence overview
+2. "key_insights": List of 3-5 main insights with explanations
+3. "conclusions": What we can confidently conclude
+4. "limitations": What we couldn't determine or needs more research
+5. "recommendations": Suggested next steps or actions
+
+Return as JSON.
+
+"""
+SYNTHESIS_PROMPT_TAIL = """Original Research Question: {query}
+Research Depth: {depth}
+
+Key Findings:
+{findings}"""
+
+SINGLE_SHOT_PROMPT_HEAD = """You are a research analyst. Given a research question and numbered web search results, plan, analyze and report in one pass.
+
+Return a JSON object with:
+1. "plan": an object with "main_objective" (what we're trying to learn) and "sub_questions" (list of specific questions to answer)
+2. "findings": array of 5-10 key findings, each an object with "finding" and "confidence" (high/medium/low) keys
+3. "report": an object with "executive_summary" (2-3 sentence overview), "key_insights" (list of 3-5 objects with "insight" and "explanation" keys), "conclusions", "limitations" and "recommendations" (lists of strings)
+
+"""
+SINGLE_SHOT_PROMPT_TAIL = """Research Question: {query}
+Research Depth: {depth}
+
+{sources}"""
+
+# Template plan used in demo mode and for quick/standard research
+DEMO_SUB_QUESTIONS = (
+    'What are the fundamentals of {query}?',
+    'What are current trends in {query}?',
+    'What are expert opinions on {query}?',
+    'What are the challenges related to {query}?',
+    'What does the future look like for {query}?'
+)
+DEMO_SEARCH_SUFFIXES = (
+    'explained',
+    'latest trends {year}',
+    'expert analysis',
+    'challenges problems',
+    'future predictions'
+)
+
+# In-memory cache of OpenAI responses, keyed on model + temperature + prompt
+LLM_CACHE_SIZE = 1024
+LLM_CACHE_TTL_SECONDS = 3600
+
 
 class ResearchAgent:
     """Autonomous research agent that plans, searches, and synthesizes."""
@@ -33,29 +194,130 @@ class ResearchAgent:
     def __init__(self):
         self.openai_key = OPENAI_API_KEY
         self.serper_key = SERPER_API_KEY
-        self.research_history = []
+        self.research_history: deque[dict] = deque(maxlen=HISTORY_LIMIT)
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        self._cache: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._jobs: OrderedDict[str, asyncio.Task | dict] = OrderedDict()
+        self._openai_sem: asyncio.Semaphore | None = None
+        self._serper_sem: asyncio.Semaphore | None = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use.
+
+        Reusing one session keeps TCP/TLS connections to OpenAI and Serper
+        alive across every step of the pipeline. The session and the
+        per-provider semaphores are bound to the running loop, so both are
+        recreated when the loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session_loop is not loop:
+            self._openai_sem = asyncio.Semaphore(OPENAI_CONCURRENCY)
+            self._serper_sem = asyncio.Semaphore(SERPER_CONCURRENCY)
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_CONNECTION_LIMIT,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    def start_job(self, query: str, depth: str = "standard") -> str:
+        """Run research in the background and return a job id to poll."""
+        job_id = uuid.uuid4().hex
+        task = asyncio.create_task(self.research(query, depth))
+        task.add_done_callback(lambda t: self._finish_job(job_id, t))
+        self._jobs[job_id] = task
+
+        # Forget the oldest finished jobs once over the limit
+        for old_id in [j for j, job in self._jobs.items() if isinstance(job, dict)]:
+            if len(self._jobs) <= JOB_LIMIT:
+                break
+            del self._jobs[old_id]
+        return job_id
+
+    def _finish_job(self, job_id: str, task: asyncio.Task):
+        """Replace a finished job's task with its status record, logging failures."""
+        if task.cancelled():
+            record = {'id': job_id, 'status': 'error', 'error': 'Research was cancelled'}
+        elif task.exception() is not None:
+            logger.error('Research job %s failed', job_id, exc_info=task.exception())
+            record = {'id': job_id, 'status': 'error', 'error': str(task.exception())}
+        else:
+            record = {'id': job_id, 'status': 'complete', 'result': task.result()}
+
+        if job_id in self._jobs:
+            self._jobs[job_id] = record
+
+    def job_status(self, job_id: str) -> dict | None:
+        """Return the status (and result, once finished) of a background job."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if isinstance(job, asyncio.Task):
+            return {'id': job_id, 'status': 'pending'}
+        return job
 
     async def research(self, query: str, depth: str = "standard") -> dict:
+        """Run the full research pipeline and return the final result."""
+        async for event in self.research_stream(query, depth):
+            if event['event'] == 'complete':
+                return event['data']
+
+    async def research_stream(self, query: str, depth: str = "standard"):
         """
-        Main research pipeline:
-        1. Analyze query and create research plan
-        2. Execute searches in parallel
-        3. Synthesize findings
-        4. Generate final report
+        Main research pipeline, yielding an event as each stage finishes:
+        1. Analyze query and create research plan ("plan")
+        2. Execute searches in parallel ("search_done")
+        3. Synthesize findings ("findings")
+        4. Generate final report ("report")
+
+        The last event ("complete") carries the full research result. Quick
+        and standard research use a template plan and a single LLM call for
+        steps 3-4; only deep research runs every step through the model.
         """
         research_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        multi_step = depth == 'deep'
 
         # Step 1: Create research plan
-        plan = await self.create_research_plan(query, depth)
+        if multi_step:
+            plan = await self.create_research_plan(query, depth)
+        else:
+            plan = self._demo_research_plan(query, depth)
+        yield {'event': 'plan', 'data': plan}
 
         # Step 2: Execute parallel searches
         search_results = await self.execute_searches(plan['search_queries'])
-
-        # Step 3: Analyze and extract key findings
-        findings = await self.analyze_results(query, search_results)
-
-        # Step 4: Synthesize into final report
-        report = await self.synthesize_report(query, findings, depth)
+        yield {'event': 'search_done', 'data': {'sources_searched': len(search_results)}}
+
+        if multi_step:
+            # Step 3: Analyze and extract key findings (in parallel)
+            findings = await self.analyze_results(query, search_results, depth)
+            yield {'event': 'findings', 'data': findings}
+
+            # Step 4: Synthesize into final report
+            report = await self.synthesize_report(query, findings, depth)
+            yield {'event': 'report', 'data': report}
+        else:
+            # Steps 3-4: Extract findings and write the report in one call
+            combined = await self._single_shot(query, depth, search_results)
+            plan = {**plan, **combined['plan']}
+            findings = combined['findings']
+            yield {'event': 'findings', 'data': findings}
+            report = combined['report']
+            yield {'event': 'report', 'data': report}
 
         result = {
             'id': research_id,
@@ -70,190 +332,347 @@ class ResearchAgent:
         }
 
         self.research_history.append(result)
-        return result
+        yield {'event': 'complete', 'data': result}
 
     async def create_research_plan(self, query: str, depth: str) -> dict:
         """Use AI to break down the query into searchable sub-questions."""
         if DEMO_MODE:
             return self._demo_research_plan(query, depth)
 
-        async with aiohttp.ClientSession() as session:
-            prompt = f"""You are a research planning agent. Given this research question, create a comprehensive research plan.
+        session = await self._get_session()
+        prompt = PLAN_PROMPT_HEAD + PLAN_PROMPT_TAIL.format(query=query, depth=depth)
 
-Research Question: {query}
-Depth: {depth} (quick=3 searches, standard=5 searches, deep=8 searches)
-
-Return a JSON object with:
-1. "main_objective": Clear statement of what we're trying to learn
-2. "sub_questions": List of specific questions to answer
-3. "search_queries": List of optimized search queries to find answers
-4. "expected_sources": Types of sources we should look for
-
-Return ONLY valid JSON, no markdown."""
+        try:
+            async with asyncio.timeout(PLAN_TIMEOUT_SECONDS):
+                return await self._chat(
+                    session, prompt, model=PLAN_MODEL, temperature=0.7, max_tokens=PLAN_MAX_TOKENS,
+                    validate=self._validate_plan
+                )
+        except Exception as e:
+            return self._demo_research_plan(query, depth)
 
-            try:
-                async with session.post(
-                    'https://api.openai.com/v1/chat/completions',
-                    headers={
-                        'Authorization': f'Bearer {self.openai_key}',
-                        'Content-Type': 'application/json'
-                    },
-                    json={
-                        'model': 'gpt-3.5-turbo',
-                        'messages': [{'role': 'user', 'content': prompt}],
-                        'temperature': 0.7
-                    }
-                ) as resp:
-                    data = await resp.json()
-                    content = data['choices'][0]['message']['content']
-                    return json.loads(content)
-            except Exception as e:
-                return self._demo_research_plan(query, depth)
+    def _validate_plan(self, parsed: dict) -> dict:
+        """Accept a plan only if it has a non-empty list of string search queries."""
+        queries = parsed.get('search_queries')
+        if not isinstance(queries, list) or not queries or not all(isinstance(q, str) for q in queries):
+            raise ValueError('plan must have a list of string search_queries')
+        return parsed
 
     async def execute_searches(self, queries: list) -> list:
-        """Execute multiple searches in parallel."""
+        """Execute multiple searches in parallel, skipping duplicate queries."""
+        queries = self._dedupe_queries(queries, fuzzy=FUZZY_QUERY_DEDUP)
         if DEMO_MODE or not SERPER_API_KEY:
             return self._demo_search_results(queries)
 
-        async with aiohttp.ClientSession() as session:
-            tasks = [self._search_web(session, q) for q in queries]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            return [r for r in results if not isinstance(r, Exception)]
+        session = await self._get_session()
+        tasks = []
+        try:
+            async with asyncio.timeout(SEARCH_STAGE_TIMEOUT_SECONDS):
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(self._search_web(session, q)) for q in queries]
+        except TimeoutError:
+            pass
+        return [t.result() for t in tasks if t.done() and not t.cancelled()]
+
+    def _dedupe_queries(self, queries: list, fuzzy: bool = False) -> list:
+        """Drop queries that repeat (or, with fuzzy, nearly repeat) an earlier one."""
+        unique, seen = [], []
+        for query in queries:
+            key = re.sub(r'\s+', ' ', query.lower().strip())
+            if not key or key in seen:
+                continue
+            if fuzzy and any(self._similar_queries(key, k) for k in seen):
+                continue
+            seen.append(key)
+            unique.append(query)
+        return unique
+
+    def _similar_queries(self, a: str, b: str) -> bool:
+        """Compare two normalized queries on the words after their shared prefix.
+
+        Queries built from one research question share a long prefix, which
+        would otherwise dominate the similarity ratio.
+        """
+        a_words, b_words = a.split(), b.split()
+        shared = 0
+        while shared < min(len(a_words), len(b_words)) and a_words[shared] == b_words[shared]:
+            shared += 1
+        a_tail, b_tail = ' '.join(a_words[shared:]), ' '.join(b_words[shared:])
+        return SequenceMatcher(None, a_tail, b_tail).ratio() > QUERY_SIMILARITY_THRESHOLD
 
     async def _search_web(self, session: aiohttp.ClientSession, query: str) -> dict:
         """Search using Serper API (Google Search)."""
         try:
-            async with session.post(
-                'https://google.serper.dev/search',
-                headers={
-                    'X-API-KEY': self.serper_key,
-                    'Content-Type': 'application/json'
-                },
-                json={'q': query, 'num': 5}
-            ) as resp:
-                data = await resp.json()
-                return {
-                    'query': query,
-                    'results': data.get('organic', [])[:5]
-                }
+            async with asyncio.timeout(SEARCH_TIMEOUT_SECONDS):
+                data = await self._post(
+                    session,
+                    self._serper_sem,
+                    'https://google.serper.dev/search',
+                    lambda resp: resp.json(loads=orjson.loads),
+                    attempts=SERPER_RETRY_ATTEMPTS,
+                    headers={
+                        'X-API-KEY': self.serper_key,
+                        'Content-Type': 'application/json'
+                    },
+                    data=orjson.dumps({'q': query, 'num': MAX_SOURCES_PER_QUERY})
+                )
+            return {
+                'query': query,
+                'results': data.get('organic', [])[:MAX_SOURCES_PER_QUERY]
+            }
         except Exception as e:
             return {'query': query, 'results': [], 'error': str(e)}
 
-    async def analyze_results(self, original_query: str, search_results: list) -> list:
-        """Extract key findings from search results."""
+    async def analyze_results(self, original_query: str, search_results: list, depth: str = "standard") -> list:
+        """Extract key findings from search results, analyzing batches of queries in parallel."""
         if DEMO_MODE:
             return self._demo_findings(original_query)
 
-        findings = []
-        async with aiohttp.ClientSession() as session:
-            for result in search_results:
-                if not result.get('results'):
-                    continue
+        session = await self._get_session()
+        tasks = []
+        try:
+            async with asyncio.timeout(ANALYSIS_TIMEOUTS.get(depth, ANALYSIS_TIMEOUTS['standard'])):
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [
+                        tg.create_task(self._analyze_batch(session, original_query, batch))
+                        for batch in self._batch_results(search_results)
+                    ]
+        except TimeoutError:
+            pass
 
-                sources_text = "\n".join([
-                    f"- {r.get('title', 'Untitled')}: {r.get('snippet', 'No description')}"
-                    for r in result['results']
-                ])
+        findings = [f for t in tasks if t.done() and not t.cancelled() for f in t.result()]
 
-                prompt = f"""Analyze these search results for the query "{result['query']}"
-in the context of researching: "{original_query}"
+        return findings if findings else self._demo_findings(original_query)
 
-Sources:
-{sources_text}
-
-Extract 2-3 key findings. Return as JSON array of objects with "finding" and "confidence" (high/medium/low) keys."""
-
-                try:
-                    async with session.post(
-                        'https://api.openai.com/v1/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {self.openai_key}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': 'gpt-3.5-turbo',
-                            'messages': [{'role': 'user', 'content': prompt}],
-                            'temperature': 0.3
-                        }
-                    ) as resp:
-                        data = await resp.json()
-                        content = data['choices'][0]['message']['content']
-                        parsed = json.loads(content)
-                        findings.extend(parsed)
-                except:
-                    continue
+    def _sources_text(self, result: dict) -> str:
+        """Format one query's search results as a bounded bullet list for a prompt."""
+        return "\n".join(
+            f"- {r.get('title', 'Untitled')}: {r.get('snippet', 'No description')[:SNIPPET_MAX_CHARS]}"
+            for r in result['results'][:MAX_SOURCES_PER_QUERY]
+        )
+
+    def _batch_results(self, search_results: list) -> list:
+        """Group (query, sources_text) pairs into batches bounded by count and prompt size."""
+        batches, batch, batch_chars = [], [], 0
+        for result in search_results:
+            if not result.get('results'):
+                continue
+
+            sources_text = self._sources_text(result)
+            if batch and (len(batch) == ANALYSIS_BATCH_SIZE
+                          or batch_chars + len(sources_text) > ANALYSIS_BATCH_MAX_CHARS):
+                batches.append(batch)
+                batch, batch_chars = [], 0
+            batch.append((result['query'], sources_text))
+            batch_chars += len(sources_text)
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _analyze_batch(self, session: aiohttp.ClientSession, original_query: str, batch: list) -> list:
+        """Extract key findings for a batch of queries in one call ([] on failure)."""
+        queries_text = "\n\n".join(
+            ANALYSIS_QUERY_BLOCK.format(index=i, query=query, sources=sources_text)
+            for i, (query, sources_text) in enumerate(batch, start=1)
+        )
+
+        prompt = ANALYSIS_PROMPT_HEAD + ANALYSIS_PROMPT_TAIL.format(
+            original_query=original_query, queries=queries_text
+        )
 
-        return findings if findings else self._demo_findings(original_query)
+        try:
+            async with asyncio.timeout(ANALYSIS_CALL_TIMEOUT_SECONDS):
+                return await self._chat(
+                    session, prompt, model=ANALYSIS_MODEL, temperature=0.3,
+                    max_tokens=ANALYSIS_MAX_TOKENS * len(batch), validate=self._validate_analysis
+                )
+        except Exception:
+            return []
+
+    def _validate_analysis(self, parsed: dict) -> list:
+        """Flatten a batch analysis reply into its findings, rejecting malformed replies."""
+        results = parsed.get('results')
+        if not isinstance(results, list) or not all(isinstance(entry, dict) for entry in results):
+            raise ValueError('analysis must have a list of result objects')
+        findings = [f for entry in results for f in entry.get('findings', [])]
+        if not all(isinstance(f, dict) for f in findings):
+            raise ValueError('findings must be objects')
+        return findings
 
     async def synthesize_report(self, query: str, findings: list, depth: str) -> dict:
         """Synthesize all findings into a comprehensive report."""
         if DEMO_MODE:
             return self._demo_report(query, findings)
 
-        findings_text = "\n".join([
+        findings_text = "\n".join(
             f"- [{f.get('confidence', 'medium')}] {f.get('finding', f)}"
             for f in findings
-        ])
+        )
 
-        async with aiohttp.ClientSession() as session:
-            prompt = f"""You are a research analyst synthesizing findings into a comprehensive report.
+        session = await self._get_session()
+        prompt = SYNTHESIS_PROMPT_HEAD + SYNTHESIS_PROMPT_TAIL.format(
+            query=query, depth=depth, findings=findings_text
+        )
 
-Original Research Question: {query}
-Research Depth: {depth}
-
-Key Findings:
-{findings_text}
+        try:
+            async with asyncio.timeout(SYNTHESIS_TIMEOUT_SECONDS):
+                return await self._chat(
+                    session, prompt, model=SYNTHESIS_MODEL, temperature=0.5, max_tokens=SYNTHESIS_MAX_TOKENS
+                )
+        except Exception:
+            return self._demo_report(query, findings)
 
-Create a research report with:
-1. "executive_summary": 2-3 sentence overview
-2. "key_insights": List of 3-5 main insights with explanations
-3. "conclusions": What we can confidently conclude
-4. "limitations": What we couldn't determine or needs more research
-5. "recommendations": Suggested next steps or actions
+    async def _single_shot(self, query: str, depth: str, search_results: list) -> dict:
+        """Refine the plan, extract findings and write the report in one LLM call.
 
-Return as JSON."""
+        Falls back to the separate analysis and synthesis steps on failure.
+        """
+        if not DEMO_MODE:
+            sources_text = "\n\n".join(
+                ANALYSIS_QUERY_BLOCK.format(index=i, query=result['query'], sources=self._sources_text(result))
+                for i, result in enumerate((r for r in search_results if r.get('results')), start=1)
+            )
+            prompt = SINGLE_SHOT_PROMPT_HEAD + SINGLE_SHOT_PROMPT_TAIL.format(
+                query=query, depth=depth, sources=sources_text
+            )
 
             try:
-                async with session.post(
-                    'https://api.openai.com/v1/chat/completions',
-                    headers={
-                        'Authorization': f'Bearer {self.openai_key}',
-                        'Content-Type': 'application/json'
-                    },
-                    json={
-                        'model': 'gpt-3.5-turbo',
-                        'messages': [{'role': 'user', 'content': prompt}],
-                        'temperature': 0.5
-                    }
-                ) as resp:
-                    data = await resp.json()
-                    content = data['choices'][0]['message']['content']
-                    return json.loads(content)
-            except:
-                return self._demo_report(query, findings)
+                session = await self._get_session()
+                async with asyncio.timeout(SYNTHESIS_TIMEOUT_SECONDS):
+                    return await self._chat(
+                        session, prompt, model=SYNTHESIS_MODEL, temperature=0.5,
+                        max_tokens=SINGLE_SHOT_MAX_TOKENS, validate=self._validate_single_shot
+                    )
+            except Exception:
+                pass
+
+        findings = await self.analyze_results(query, search_results, depth)
+        report = await self.synthesize_report(query, findings, depth)
+        return {'plan': {}, 'findings': findings, 'report': report}
+
+    def _validate_single_shot(self, parsed: dict) -> dict:
+        """Check a single-shot reply's shape and keep only the plan fields it may refine."""
+        plan, findings, report = parsed.get('plan', {}), parsed.get('findings'), parsed.get('report')
+        if not isinstance(findings, list) or not all(isinstance(f, dict) for f in findings):
+            raise ValueError('findings must be a list of objects')
+        if not isinstance(report, dict):
+            raise ValueError('report must be an object')
+        if not isinstance(plan, dict):
+            plan = {}
+        return {
+            'plan': {k: plan[k] for k in ('main_objective', 'sub_questions') if k in plan},
+            'findings': findings,
+            'report': report
+        }
+
+    async def _chat(self, session: aiohttp.ClientSession, prompt: str, *,
+                    model: str, temperature: float, max_tokens: int, validate=None):
+        """Send a single-message chat completion and parse the JSON reply.
+
+        The model is constrained to reply with a JSON object. The completion
+        is streamed, and accepted replies are cached, so a repeated prompt
+        skips the API call. `validate`, if given, is called with the parsed
+        reply and returns the value to use, or raises to reject it; rejected
+        replies are never cached.
+        """
+        key = hashlib.sha256(f'{model}|{temperature}|{max_tokens}|{prompt}'.encode()).hexdigest()
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        content = await self._post(
+            session,
+            self._openai_sem,
+            'https://api.openai.com/v1/chat/completions',
+            self._read_stream,
+            timeout=OPENAI_STREAM_TIMEOUT,
+            headers={
+                'Authorization': f'Bearer {self.openai_key}',
+                'Content-Type': 'application/json'
+            },
+            data=orjson.dumps({
+                'model': model,
+                'messages': [{'role': 'user', 'content': prompt}],
+                'temperature': temperature,
+                'max_tokens': max_tokens,
+                'response_format': {'type': 'json_object'},
+                'stream': True
+            })
+        )
+        parsed = orjson.loads(content)
+        if validate is not None:
+            parsed = validate(parsed)
+
+        self._cache_put(key, parsed)
+        return parsed
+
+    async def _post(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                    url: str, read, attempts: int = RETRY_ATTEMPTS, **kwargs):
+        """POST under a per-provider concurrency limit, retrying 429/5xx with backoff.
+
+        `read` is awaited with the successful response and its result returned.
+        """
+        for attempt in range(attempts):
+            async with semaphore:
+                async with session.post(url, **kwargs) as resp:
+                    if resp.status not in RETRY_STATUSES or attempt == attempts - 1:
+                        resp.raise_for_status()
+                        return await read(resp)
+            await asyncio.sleep(min(RETRY_BACKOFF_SECONDS * 2 ** attempt, RETRY_BACKOFF_MAX_SECONDS))
+
+    async def _read_stream(self, resp: aiohttp.ClientResponse) -> str:
+        """Assemble the message content from a streamed (SSE) chat completion."""
+        parts = []
+        async for raw_line in resp.content:
+            line = raw_line.strip()
+            if not line.startswith(b'data:'):
+                continue
+            payload = line[len(b'data:'):].strip()
+            if payload == b'[DONE]':
+                break
+            chunk = orjson.loads(payload)
+            if not chunk.get('choices'):
+                continue
+            delta = chunk['choices'][0].get('delta', {}).get('content')
+            if delta:
+                parts.append(delta)
+        return ''.join(parts)
+
+    def _cache_get(self, key: str):
+        """Return a cached response, or None if missing or expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > LLM_CACHE_TTL_SECONDS:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: str, value):
+        """Store a response, evicting the least recently used entry when full."""
+        self._cache[key] = (time.monotonic(), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > LLM_CACHE_SIZE:
+            self._cache.popitem(last=False)
 
     # Demo mode methods
     def _demo_research_plan(self, query: str, depth: str) -> dict:
         """Generate demo research plan."""
         num_searches = {'quick': 3, 'standard': 5, 'deep': 8}.get(depth, 5)
+        year = datetime.now().year
 
         plans = {
             'default': {
                 'main_objective': f'Understand the key aspects of: {query}',
-                'sub_questions': [
-                    f'What are the fundamentals of {query}?',
-                    f'What are current trends in {query}?',
-                    f'What are expert opinions on {query}?',
-                    f'What are the challenges related to {query}?',
-                    f'What does the future look like for {query}?'
-                ][:num_searches],
-                'search_queries': [
-                    f'{query} explained',
-                    f'{query} latest trends 2024',
-                    f'{query} expert analysis',
-                    f'{query} challenges problems',
-                    f'{query} future predictions'
-                ][:num_searches],
+                'sub_questions': list(islice(
+                    (template.format(query=query) for template in DEMO_SUB_QUESTIONS), num_searches
+                )),
+                'search_queries': list(islice(
+                    (f'{query} {suffix.format(year=year)}' for suffix in DEMO_SEARCH_SUFFIXES), num_searches
+                )),
                 'expected_sources': ['Industry reports', 'News articles', 'Expert blogs', 'Academic papers']
             }
         }
@@ -328,41 +747,78 @@ Return as JSON."""
 agent = ResearchAgent()
 
 
+@app.after_serving
+async def shutdown_agent():
+    """Close the agent's HTTP session when the server stops."""
+    await agent.close()
+
+
 @app.route('/')
-def index():
+async def index():
     """Main research interface."""
-    return render_template('index.html', demo_mode=DEMO_MODE)
+    return await render_template('index.html', demo_mode=DEMO_MODE)
 
 
 @app.route('/api/research', methods=['POST'])
-def start_research():
-    """Start a new research task."""
-    data = request.get_json()
+async def start_research():
+    """Start a new research task in the background."""
+    data = await request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
     query = data.get('query', '')
     depth = data.get('depth', 'standard')
 
     if not query:
         return jsonify({'error': 'Query is required'}), 400
 
-    # Run async research
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(agent.research(query, depth))
-    finally:
-        loop.close()
+    job_id = agent.start_job(query, depth)
+
+    return jsonify({'id': job_id, 'status': 'pending'}), 202
+
+
+@app.route('/api/research/stream')
+async def stream_research():
+    """Run a research task, streaming an event per pipeline stage (SSE)."""
+    query = request.args.get('query', '')
+    depth = request.args.get('depth', 'standard')
+
+    if not query:
+        return jsonify({'error': 'Query is required'}), 400
+
+    async def generate():
+        try:
+            async for event in agent.research_stream(query, depth):
+                yield f"data: {orjson.dumps(event).decode()}\n\n"
+        except Exception as e:
+            logger.error('Research stream failed', exc_info=e)
+            error = {'event': 'error', 'data': {'error': str(e)}}
+            yield f"data: {orjson.dumps(error).decode()}\n\n"
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.timeout = None  # Deep research can outlast Quart's default response timeout
+    return response
+
+
+@app.route('/api/research/<job_id>')
+async def get_research(job_id):
+    """Poll a research task for its status and result."""
+    job = agent.job_status(job_id)
+    if job is None:
+        return jsonify({'error': 'Research not found'}), 404
 
-    return jsonify(result)
+    return jsonify(job)
 
 
 @app.route('/api/history')
-def get_history():
-    """Get research history."""
-    return jsonify(agent.research_history[-10:])  # Last 10 researches
+async def get_history():
+    """Get the most recent research results."""
+    history = agent.research_history
+    return jsonify(list(islice(history, max(0, len(history) - HISTORY_PAGE_SIZE), None)))
 
 
 @app.route('/api/status')
-def status():
+async def status():
     """API status check."""
     return jsonify({
         'status': 'operational',